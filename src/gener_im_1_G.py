@@ -17,6 +17,7 @@ from PIL import Image, ImageDraw, ImageFont
 import locale
 import sys
 from telegram_notify import send_error
+from utils import get_log_handle
 
 # Спроба встановити локаль для українських назв місяців
 try:
@@ -48,24 +49,26 @@ def log(message):
     line = f"{timestamp} [gener_im_1_G] {message}"
     print(line)
     try:
-        with open(FULL_LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(line + "\n")
+        get_log_handle(FULL_LOG_FILE).write(line + "\n")
     except Exception as e:
         print(f"Помилка логування: {e}")
 
 class Config:
     """Клас для зберігання всіх констант конфігурації"""
-    CELL_W = 44 # Ширина однієї клітинки (1 година)
-    CELL_H = 36 # Висота однієї клітинки
-    LEFT_COL_W = 160 # Ширина лівої колонки з назвами груп
-    SPACING = 60 # Відступи з усіх сторін
-    HEADER_SPACING = 45 # Відстань між заголовком і рядком годин
-    LEGEND_H = 100 # Висота області для легенди та інформації внизу
-    HOUR_ROW_H = 70 # Висота рядка з годинами над таблицею
-    HEADER_H = 34 # Висота заголовка
-    RIGHT_TITLE_PADDING = 12 # Відступ між текстом правого заголовка і його фоном
-    RIGHT_TITLE_RADIUS = 20 # Радіус заокруглення фону правого заголовка
-    RIGHT_TITLE_EXTRA_H = 10 # Додаткова висота фону правого заголовка для кращого вигляду
+    OUTPUT_SCALE = 3 # Масштаб: малюємо одразу у фінальній роздільності, без resize
+    CELL_W = 44 * OUTPUT_SCALE # Ширина однієї клітинки (1 година)
+    CELL_H = 36 * OUTPUT_SCALE # Висота однієї клітинки
+    LEFT_COL_W = 160 * OUTPUT_SCALE # Ширина лівої колонки з назвами груп
+    SPACING = 60 * OUTPUT_SCALE # Відступи з усіх сторін
+    HEADER_SPACING = 45 * OUTPUT_SCALE # Відстань між заголовком і рядком годин
+    LEGEND_H = 100 * OUTPUT_SCALE # Висота області для легенди та інформації внизу
+    HOUR_ROW_H = 70 * OUTPUT_SCALE # Висота рядка з годинами над таблицею
+    HEADER_H = 34 * OUTPUT_SCALE # Висота заголовка
+    RIGHT_TITLE_PADDING = 12 * OUTPUT_SCALE # Відступ між текстом правого заголовка і його фоном
+    RIGHT_TITLE_RADIUS = 20 * OUTPUT_SCALE # Радіус заокруглення фону правого заголовка
+    RIGHT_TITLE_EXTRA_H = 10 * OUTPUT_SCALE # Додаткова висота фону правого заголовка для кращого вигляду
+    RIGHT_TITLE_BORDER = 3 * OUTPUT_SCALE # Товщина рамки правого заголовка
+    LINE_W = OUTPUT_SCALE # Товщина ліній сітки
     
     TITLE_FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
     FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
@@ -89,9 +92,8 @@ class Config:
     FOOTER_COLOR = (140, 140, 140)
     WORSE_OUTLINE = (220, 53, 69)
     BETTER_OUTLINE = (40, 167, 69)
-    HIGHLIGHT_WIDTH = 3 # Ширина контуру для підсвічування змін
+    HIGHLIGHT_WIDTH = 3 * OUTPUT_SCALE # Ширина контуру для підсвічування змін
     TIMEZONE = "Europe/Kyiv" # Часова зона для відображення дат і часу
-    OUTPUT_SCALE = 3 # Масштаб для покращення якості зображення при збереженні
 
 def load_previous_state():
     """Завантажує попередній стан графіків"""
@@ -151,7 +153,7 @@ class FontManager:
     def get_font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
         try:
             path = Config.TITLE_FONT_PATH if bold else Config.FONT_PATH
-            return ImageFont.truetype(path, size=size)
+            return ImageFont.truetype(path, size=size * Config.OUTPUT_SCALE)
         except Exception as e:
             log(f"Помилка завантаження шрифту: {e}")
             return ImageFont.load_default()
@@ -240,7 +242,7 @@ class ImageRenderer:
         
         width = (Config.SPACING * 2 + Config.LEFT_COL_W + n_hours * Config.CELL_W)
         height = (Config.SPACING * 2 + Config.HEADER_H + Config.HOUR_ROW_H + 
-                 n_rows * Config.CELL_H + Config.LEGEND_H + 40 + Config.HEADER_SPACING)
+                 n_rows * Config.CELL_H + Config.LEGEND_H + 40 * Config.OUTPUT_SCALE + Config.HEADER_SPACING)
         
         return Image.new("RGB", (width, height), Config.BG)
     
@@ -267,7 +269,7 @@ class ImageRenderer:
                              radius=Config.RIGHT_TITLE_RADIUS, 
                              fill=Config.HIGHLIGHT_BG, 
                              outline=Config.HIGHLIGHT_BORDER, 
-                             width=3)
+                             width=Config.RIGHT_TITLE_BORDER)
         
         text_x = x0_bg + (x1_bg - x0_bg - w_right) / 2
         text_y = y0_bg + (y1_bg - y0_bg - h_right) / 2
@@ -285,7 +287,7 @@ class ImageRenderer:
             x0 = table_x0 + Config.LEFT_COL_W + h * Config.CELL_W
             x1 = x0 + Config.CELL_W
             draw.rectangle([x0, hour_y0, x1, hour_y1], 
-                          fill=Config.HEADER_BG, outline=Config.GRID_COLOR)
+                          fill=Config.HEADER_BG, outline=Config.GRID_COLOR, width=Config.LINE_W)
             
             next_hour = (h + 1) % 24
             lines = [f"{h:02d}", "–", f"{next_hour:02d}"]
@@ -306,7 +308,7 @@ class ImageRenderer:
         
         draw.rectangle([table_x0, table_y0 - Config.HOUR_ROW_H, 
                        table_x0 + Config.LEFT_COL_W, table_y0], 
-                      fill=Config.HEADER_BG, outline=Config.GRID_COLOR)
+                      fill=Config.HEADER_BG, outline=Config.GRID_COLOR, width=Config.LINE_W)
         
         font_date = self.font_manager.get_font(Config.DATE_FONT_SIZE)
         header_text = "Дата"
@@ -321,7 +323,7 @@ class ImageRenderer:
         for r, day_key in enumerate(day_keys):
             y0 = table_y0 + r * Config.CELL_H
             draw.rectangle([table_x0, y0, table_x0 + Config.LEFT_COL_W, y0 + Config.CELL_H], 
-                          fill=Config.TABLE_BG, outline=Config.GRID_COLOR)
+                          fill=Config.TABLE_BG, outline=Config.GRID_COLOR, width=Config.LINE_W)
             
             dt = datetime.fromtimestamp(int(day_key), ZoneInfo(Config.TIMEZONE))
             date_label = dt.strftime("%d %B")
@@ -379,18 +381,16 @@ class ImageRenderer:
             left_color = right_color = Config.AVAILABLE_COLOR
 
         if left_color == right_color:
-            draw.rectangle([x0, y0, x1, y1], fill=left_color, outline=outline_color)
+            draw.rectangle([x0, y0, x1, y1], fill=left_color, outline=outline_color, width=Config.LINE_W)
         else:
             draw.rectangle([x0, y0, x0 + half_width, y1], fill=left_color)
             draw.rectangle([x0 + half_width, y0, x1, y1], fill=right_color)
-            draw.rectangle([x0, y0, x1, y1], outline=outline_color, fill=None)
+            draw.rectangle([x0, y0, x1, y1], outline=outline_color, fill=None, width=Config.LINE_W)
         
         if change_type == "worse":
-            for i in range(Config.HIGHLIGHT_WIDTH):
-                draw.rectangle([x0 + i, y0 + i, x1 - i, y1 - i], outline=Config.WORSE_OUTLINE)
+            draw.rectangle([x0, y0, x1, y1], outline=Config.WORSE_OUTLINE, width=Config.HIGHLIGHT_WIDTH)
         elif change_type == "better":
-            for i in range(Config.HIGHLIGHT_WIDTH):
-                draw.rectangle([x0 + i, y0 + i, x1 - i, y1 - i], outline=Config.BETTER_OUTLINE)
+            draw.rectangle([x0, y0, x1, y1], outline=Config.BETTER_OUTLINE, width=Config.HIGHLIGHT_WIDTH)
     
     def _draw_data_cells(self, draw: ImageDraw.Draw, day_keys: list) -> None:
         table_x0 = Config.SPACING
@@ -452,12 +452,12 @@ class ImageRenderer:
         for i in range(25):
             x = table_x0 + Config.LEFT_COL_W + i * Config.CELL_W
             draw.line([(x, table_y0 - Config.HOUR_ROW_H), (x, table_y1)], 
-                     fill=Config.GRID_COLOR)
+                     fill=Config.GRID_COLOR, width=Config.LINE_W)
         
         for r in range(n_rows + 1):
             y = table_y0 + r * Config.CELL_H
             draw.line([(table_x0, y), (table_x1, y)], 
-                     fill=Config.GRID_COLOR)
+                     fill=Config.GRID_COLOR, width=Config.LINE_W)
     
     def _get_description_for_state(self, state: str) -> str:
         preset = self.data.get("preset", {})
@@ -486,9 +486,9 @@ class ImageRenderer:
             description = self._get_description_for_state(state)
             legend_items.append((color, description, state))
         
-        legend_y = table_y1 + 15
-        box_size = 20
-        gap = 15
+        legend_y = table_y1 + 15 * Config.OUTPUT_SCALE
+        box_size = 20 * Config.OUTPUT_SCALE
+        gap = 15 * Config.OUTPUT_SCALE
         x_cursor = Config.SPACING
         
         font_legend = self.font_manager.get_font(Config.LEGEND_FONT_SIZE)
@@ -496,12 +496,12 @@ class ImageRenderer:
         for col, text, state in legend_items:
             text_bbox = draw.textbbox((0, 0), text, font=font_legend)
             w_text = text_bbox[2] - text_bbox[0]
-            block_w = box_size + 6 + w_text
+            block_w = box_size + 6 * Config.OUTPUT_SCALE + w_text
             
             draw.rectangle([x_cursor, legend_y, x_cursor + box_size, legend_y + box_size], 
-                          fill=col, outline=Config.GRID_COLOR)
+                          fill=col, outline=Config.GRID_COLOR, width=Config.LINE_W)
             
-            draw.text((x_cursor + box_size + 4, legend_y + (box_size - (text_bbox[3]-text_bbox[1]))/2), 
+            draw.text((x_cursor + box_size + 4 * Config.OUTPUT_SCALE, legend_y + (box_size - (text_bbox[3]-text_bbox[1]))/2), 
                      text, fill=Config.TEXT_COLOR, font=font_legend)
             x_cursor += block_w + gap
         
@@ -512,15 +512,15 @@ class ImageRenderer:
                           fill=Config.TABLE_BG, outline=Config.WORSE_OUTLINE, width=Config.HIGHLIGHT_WIDTH)
             worse_text = "Більше відключень"
             text_bbox = draw.textbbox((0, 0), worse_text, font=font_legend)
-            draw.text((x_cursor + box_size + 4, legend_y + (box_size - (text_bbox[3]-text_bbox[1]))/2), 
+            draw.text((x_cursor + box_size + 4 * Config.OUTPUT_SCALE, legend_y + (box_size - (text_bbox[3]-text_bbox[1]))/2), 
                      worse_text, fill=Config.TEXT_COLOR, font=font_legend)
-            x_cursor += box_size + 4 + (text_bbox[2] - text_bbox[0]) + gap
+            x_cursor += box_size + 4 * Config.OUTPUT_SCALE + (text_bbox[2] - text_bbox[0]) + gap
             
             draw.rectangle([x_cursor, legend_y, x_cursor + box_size, legend_y + box_size], 
                           fill=Config.TABLE_BG, outline=Config.BETTER_OUTLINE, width=Config.HIGHLIGHT_WIDTH)
             better_text = "Менше відключень"
             text_bbox = draw.textbbox((0, 0), better_text, font=font_legend)
-            draw.text((x_cursor + box_size + 4, legend_y + (box_size - (text_bbox[3]-text_bbox[1]))/2), 
+            draw.text((x_cursor + box_size + 4 * Config.OUTPUT_SCALE, legend_y + (box_size - (text_bbox[3]-text_bbox[1]))/2), 
                      better_text, fill=Config.TEXT_COLOR, font=font_legend)
     
     def _get_color_for_state(self, state: str) -> tuple:
@@ -551,12 +551,12 @@ class ImageRenderer:
                         Config.HEADER_SPACING + len(self.processor.get_dates_for_display(self.data)) * Config.CELL_H + 
                         Config.LEGEND_H)
         
-        draw.text((width - w_pub - Config.SPACING, legend_bottom - 20), 
+        draw.text((width - w_pub - Config.SPACING, legend_bottom - 20 * Config.OUTPUT_SCALE), 
                  pub_label, fill=Config.FOOTER_COLOR, font=font_small)
         
         x_text = Config.SPACING
-        y_base = legend_bottom - 20
-        line_gap = 6
+        y_base = legend_bottom - 20 * Config.OUTPUT_SCALE
+        line_gap = 6 * Config.OUTPUT_SCALE
 
         info_lines = [
             "Цей проєкт створено волонтерами для вас. Разом ми можемо зробити інформацію доступною для всіх.",
@@ -574,10 +574,7 @@ class ImageRenderer:
         safe_group_name = self.group_name.replace('GPV', '').replace('.', '-')
         out_name = OUT_DIR / f"gpv-{safe_group_name}-emergency.png"
         
-        img_resized = img.resize((img.width * Config.OUTPUT_SCALE, 
-                                img.height * Config.OUTPUT_SCALE), 
-                               resample=Image.LANCZOS)
-        img_resized.save(out_name, optimize=True)
+        img.save(out_name, optimize=False, compress_level=1)
         log(f"✅ Збережено {out_name}")
 
 def generate_from_json(json_path: str, prev_state: dict = None):
@@ -608,10 +605,10 @@ def generate_from_json(json_path: str, prev_state: dict = None):
 
 def load_latest_json(json_dir: Path):
     """Завантаження останнього JSON"""
-    files = sorted(json_dir.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
-    if not files:
+    latest = max(json_dir.glob("*.json"), key=lambda p: p.stat().st_mtime, default=None)
+    if latest is None:
         raise FileNotFoundError("Не знайдено JSON файлів у " + str(json_dir))
-    return files[0]
+    return latest
 
 def main():
     """Основна функція"""
@@ -13,9 +13,12 @@ from pathlib import Path
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from PIL import Image, ImageDraw, ImageFont
+import numpy as np
 import os
+import re
 import sys
 from telegram_notify import send_error, send_photo, send_message
+from utils import get_log_handle, json_loads
 
 # --- Налаштування шляхів ---
 BASE = Path(__file__).parent.parent.absolute()
@@ -29,29 +32,37 @@ LOG_DIR = BASE / "logs"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 FULL_LOG_FILE = LOG_DIR / "full_log.log"
 
+# Часовий пояс створюємо один раз; підписи дат кешуємо за timestamp
+_KYIV = ZoneInfo("Europe/Kyiv")
+_date_str_cache = {}
+
+# Номер групи для сортування ("GPV3.1" -> 3)
+_RE_GROUP_NUM = re.compile(r"(\d+)")
+
 # Файл для збереження попереднього стану
 PREV_STATE_FILE = PREV_STATE_DIR / "previous_state.json"
 
 def log(message):
-    timestamp = datetime.now(ZoneInfo("Europe/Kyiv")).strftime("%Y-%m-%d %H:%M:%S")
+    timestamp = datetime.now(_KYIV).strftime("%Y-%m-%d %H:%M:%S")
     line = f"{timestamp} [gener_im_full] {message}"
     print(line)
     try:
-        with open(FULL_LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(line + "\n")
+        get_log_handle(FULL_LOG_FILE).write(line + "\n")
     except Exception:
         pass
 
 # --- Візуальні параметри ---
-CELL_W = 44 # Ширина однієї клітинки (1 година)
-CELL_H = 36 # Висота однієї клітинки
-LEFT_COL_W = 140 # Ширина лівої колонки з назвами груп
-HEADER_H = 34 # Висота заголовка
-SPACING = 60 # Відступи з усіх сторін
-LEGEND_H = 100 # Висота області для легенди та інформації внизу
-HOUR_ROW_H = 90 # Висота рядка з годинами над таблицею
-HEADER_SPACING = 35 # Відстань між заголовком і рядком годин
-HOUR_LINE_GAP = 15 # Відстань між рядками годин (наприклад, між "00", "-", "01")
+SCALE = 3 # Масштаб: малюємо одразу у фінальній роздільності, без resize
+CELL_W = 44 * SCALE # Ширина однієї клітинки (1 година)
+CELL_H = 36 * SCALE # Висота однієї клітинки
+LEFT_COL_W = 140 * SCALE # Ширина лівої колонки з назвами груп
+HEADER_H = 34 * SCALE # Висота заголовка
+SPACING = 60 * SCALE # Відступи з усіх сторін
+LEGEND_H = 100 * SCALE # Висота області для легенди та інформації внизу
+HOUR_ROW_H = 90 * SCALE # Висота рядка з годинами над таблицею
+HEADER_SPACING = 35 * SCALE # Відстань між заголовком і рядком годин
+HOUR_LINE_GAP = 15 * SCALE # Відстань між рядками годин (наприклад, між "00", "-", "01")
+LINE_W = SCALE # Товщина ліній сітки
 
 # --- Шрифти ---
 TITLE_FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
@@ -76,7 +87,7 @@ FOOTER_COLOR = (140, 140, 140)
 # Кольори для підсвічування змін
 WORSE_OUTLINE = (220, 53, 69)  # Червоний - більше відключень
 BETTER_OUTLINE = (40, 167, 69)  # Зелений - менше відключень
-HIGHLIGHT_WIDTH = 3  # Товщина обводки
+HIGHLIGHT_WIDTH = 3 * SCALE  # Товщина обводки
 
 # --- Функції для роботи з попереднім станом ---
 def load_previous_state():
@@ -96,7 +107,7 @@ def save_current_state(data: dict):
         state_to_save = {
             "data": fact.get("data", {}),
             "update": fact.get("update"),
-            "timestamp": datetime.now(ZoneInfo("Europe/Kyiv")).isoformat()
+            "timestamp": datetime.now(_KYIV).isoformat()
         }
         with open(PREV_STATE_FILE, "w", encoding="utf-8") as f:
             json.dump(state_to_save, f, ensure_ascii=False, indent=2)
@@ -139,18 +150,18 @@ def compare_states(old_state: str, new_state: str) -> str:
 
 # --- Завантаження останнього JSON ---
 def load_latest_json(json_dir: Path):
-    files = sorted(json_dir.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
-    if not files:
+    latest = max(json_dir.glob("*.json"), key=lambda p: p.stat().st_mtime, default=None)
+    if latest is None:
         raise FileNotFoundError("Не знайдено JSON файлів у " + str(json_dir))
-    with open(files[0], "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return data, files[0]
+    with open(latest, "rb") as f:
+        data = json_loads(f.read())
+    return data, latest
 
 # --- Вибір шрифту з fallback ---
 def pick_font(size, bold=False):
     try:
         path = TITLE_FONT_PATH if bold else FONT_PATH
-        return ImageFont.truetype(path, size=size)
+        return ImageFont.truetype(path, size=size * SCALE)
     except Exception:
         try:
             return ImageFont.load_default()
@@ -176,6 +187,14 @@ def cleanup_tomorrow_image(generated_files: list):
             log(f"⚠️ Помилка при видаленні {tomorrow_file}: {e}")
 
 # --- Визначення дат для генерації ---
+def format_day(timestamp: int) -> str:
+    """Дата "ДД.ММ.РРРР" (Київ) для timestamp початку доби"""
+    date_str = _date_str_cache.get(timestamp)
+    if date_str is None:
+        date_str = datetime.fromtimestamp(timestamp, _KYIV).strftime("%d.%m.%Y")
+        _date_str_cache[timestamp] = date_str
+    return date_str
+
 def get_dates_to_generate(fact_data: dict) -> list:
     """
     Повертає список кортежів (timestamp, day_key, filename, date_label) для генерації.
@@ -198,9 +217,8 @@ def get_dates_to_generate(fact_data: dict) -> list:
         sorted_dates = sorted(available_dates)
     
     # Отримуємо поточну дату (початок доби) в Києві
-    kyiv_tz = ZoneInfo("Europe/Kyiv")
-    now = datetime.now(kyiv_tz)
-    today_start = datetime(now.year, now.month, now.day, tzinfo=kyiv_tz)
+    now = datetime.now(_KYIV)
+    today_start = datetime(now.year, now.month, now.day, tzinfo=_KYIV)
     today_ts = int(today_start.timestamp())
     tomorrow_ts = today_ts + 86400  # +1 день
     
@@ -208,8 +226,7 @@ def get_dates_to_generate(fact_data: dict) -> list:
     
     for day_key in sorted_dates:
         timestamp = int(day_key)
-        date_obj = datetime.fromtimestamp(timestamp, kyiv_tz)
-        date_str = date_obj.strftime("%d.%m.%Y")
+        date_str = format_day(timestamp)
         
         # Визначаємо, це сьогодні чи завтра
         day_diff = (timestamp - today_ts) // 86400
@@ -240,7 +257,7 @@ def get_dates_to_generate(fact_data: dict) -> list:
         # Якщо не знайшли підходящих дат, беремо останню як today
         day_key = sorted_dates[-1]
         timestamp = int(day_key)
-        date_str = datetime.fromtimestamp(timestamp, kyiv_tz).strftime("%d.%m.%Y")
+        date_str = format_day(timestamp)
         result.append((timestamp, day_key, "gpv-all-today.png", date_str))
         log(f"Використовую останню дату як today: {day_key} ({date_str})")
     
@@ -273,10 +290,9 @@ def get_description_for_state(state: str, preset: dict) -> str:
     }
     return time_type.get(state, descriptions.get(state, "Невідомий стан"))
 
-# --- Функція для малювання розділеної клітинки ---
-def draw_split_cell(draw, x0, y0, x1, y1, state, prev_state, next_state, change_type=None):
-    half = (x1 - x0) // 2
-
+# --- Кольори лівої та правої половини клітинки ---
+def split_cell_colors(state, prev_state, next_state):
+    """Повертає (колір лівої половини, колір правої половини) для години"""
     if state == "yes":
         left = right = AVAILABLE_COLOR
 
@@ -323,23 +339,26 @@ def draw_split_cell(draw, x0, y0, x1, y1, state, prev_state, next_state, change_
     else:
         left = right = AVAILABLE_COLOR
 
-    # --- Малювання ---
-    if left == right:
-        draw.rectangle([x0, y0, x1, y1], fill=left, outline=GRID_COLOR)
-    else:
-        draw.rectangle([x0, y0, x0 + half, y1], fill=left)
-        draw.rectangle([x0 + half, y0, x1, y1], fill=right)
-        draw.rectangle([x0, y0, x1, y1], outline=GRID_COLOR)
-    
-    # --- Підсвічування змін ---
+    return left, right
+
+# Таблиця (state, prev_state, next_state) -> (left, right) для всіх відомих станів,
+# будується один раз при імпорті; сусідні стани можуть бути None на краях доби
+CELL_STATES = ("yes", "no", "maybe", "first", "second", "mfirst", "msecond")
+_SPLIT_LUT = {
+    (s, p, n): split_cell_colors(s, p, n)
+    for s in CELL_STATES
+    for p in CELL_STATES + (None,)
+    for n in CELL_STATES + (None,)
+}
+
+# --- Обводка клітинки, стан якої змінився ---
+def draw_change_outline(draw, x0, y0, x1, y1, change_type):
     if change_type == "worse":
         # Червона обводка для погіршення
-        for i in range(HIGHLIGHT_WIDTH):
-            draw.rectangle([x0 + i, y0 + i, x1 - i, y1 - i], outline=WORSE_OUTLINE)
+        draw.rectangle([x0, y0, x1, y1], outline=WORSE_OUTLINE, width=HIGHLIGHT_WIDTH)
     elif change_type == "better":
         # Зелена обводка для покращення
-        for i in range(HIGHLIGHT_WIDTH):
-            draw.rectangle([x0 + i, y0 + i, x1 - i, y1 - i], outline=BETTER_OUTLINE)
+        draw.rectangle([x0, y0, x1, y1], outline=BETTER_OUTLINE, width=HIGHLIGHT_WIDTH)
 
 # --- Основна функція рендерингу ---
 def render_single_date(data: dict, day_ts: int, day_key: str, output_filename: str, date_str: str, prev_data: dict = None):
@@ -359,8 +378,7 @@ def render_single_date(data: dict, day_ts: int, day_key: str, output_filename: s
     def sort_key(s):
         try:
             if "GPV" in s:
-                import re
-                m = re.search(r"(\d+)", s)
+                m = _RE_GROUP_NUM.search(s)
                 return (0, int(m.group(1)) if m else s)
         except Exception:
             pass
@@ -371,7 +389,7 @@ def render_single_date(data: dict, day_ts: int, day_key: str, output_filename: s
     n_hours = 24
     n_rows = max(1, len(rows))
     width = SPACING*2 + LEFT_COL_W + n_hours*CELL_W
-    height = SPACING*2 + HEADER_H + HOUR_ROW_H + n_rows*CELL_H + LEGEND_H + 40
+    height = SPACING*2 + HEADER_H + HOUR_ROW_H + n_rows*CELL_H + LEGEND_H + 40*SCALE
 
     img = Image.new("RGB", (width, height), BG)
     draw = ImageDraw.Draw(img)
@@ -389,60 +407,28 @@ def render_single_date(data: dict, day_ts: int, day_key: str, output_filename: s
     w_title = bbox[2] - bbox[0]
     h_title = bbox[3] - bbox[1]
     title_x = SPACING + (LEFT_COL_W + n_hours*CELL_W - w_title) / 2
-    title_y = SPACING + 6
+    title_y = SPACING + 6*SCALE
     draw.text((title_x, title_y), title_text, fill=TEXT_COLOR, font=font_title)
 
     # --- Таблиця ---
     table_x0 = SPACING
     table_y0 = SPACING + HEADER_H + HOUR_ROW_H + HEADER_SPACING
-    table_x1 = table_x0 + LEFT_COL_W + n_hours*CELL_W
     table_y1 = table_y0 + n_rows*CELL_H
-    draw.rectangle([table_x0, table_y0, table_x1, table_y1], fill=TABLE_BG, outline=GRID_COLOR)
-
-    # --- Рядок годин ---
     hour_y0 = table_y0 - HOUR_ROW_H
-    hour_y1 = table_y0
-    for h in range(24):
-        x0 = table_x0 + LEFT_COL_W + h*CELL_W
-        x1 = x0 + CELL_W
-        draw.rectangle([x0, hour_y0, x1, hour_y1], fill=HEADER_BG, outline=GRID_COLOR)
-        start = f"{h:02d}"
-        middle = "-"
-        end = f"{(h+1)%24:02d}"
-        bbox1 = draw.textbbox((0,0), start, font=font_hour)
-        bbox2 = draw.textbbox((0,0), middle, font=font_hour)
-        bbox3 = draw.textbbox((0,0), end, font=font_hour)
-        h1 = bbox1[3]-bbox1[1]
-        h2 = bbox2[3]-bbox2[1]
-        h3 = bbox3[3]-bbox3[1]
-        total_h = h1 + HOUR_LINE_GAP + h2 + HOUR_LINE_GAP + h3
-        y_cursor = hour_y0 + (HOUR_ROW_H - total_h)/2
-        draw.text((x0 + (CELL_W - (bbox1[2]-bbox1[0]))/2, y_cursor), start, fill=TEXT_COLOR, font=font_hour)
-        y_cursor += h1 + HOUR_LINE_GAP
-        draw.text((x0 + (CELL_W - (bbox2[2]-bbox2[0]))/2, y_cursor), middle, fill=TEXT_COLOR, font=font_hour)
-        y_cursor += h2 + HOUR_LINE_GAP
-        draw.text((x0 + (CELL_W - (bbox3[2]-bbox3[0]))/2, y_cursor), end, fill=TEXT_COLOR, font=font_hour)
-
-    # --- Ліва колонка ---
-    left_label = "Черга"
-    draw.rectangle([table_x0, hour_y0, table_x0+LEFT_COL_W, hour_y1], fill=HEADER_BG, outline=GRID_COLOR)
-    bbox = draw.textbbox((0,0), left_label, font=font_hour)
-    draw.text((table_x0 + (LEFT_COL_W - (bbox[2]-bbox[0]))/2, hour_y0 + (HOUR_ROW_H - (bbox[3]-bbox[1]))/2),
-              left_label, fill=TEXT_COLOR, font=font_hour)
 
     # Лічильники змін
     changes_worse = 0
     changes_better = 0
 
-    # --- Рядки груп і клітинки ---
+    # --- Кольори клітинок ---
+    # Кольори збираємо в масив (рядок, пів-години), потім розгортаємо до пікселів
+    halves = np.empty((n_rows, n_hours*2, 3), dtype=np.uint8)
+    halves[:] = AVAILABLE_COLOR
+    changed_cells = []
+
     for r, group in enumerate(rows):
         y0 = table_y0 + r*CELL_H
         y1 = y0 + CELL_H
-        draw.rectangle([table_x0, y0, table_x0 + LEFT_COL_W, y1], outline=GRID_COLOR, fill=TABLE_BG)
-        label = group.replace("GPV", "").strip()
-        bbox = draw.textbbox((0,0), label, font=font_group)
-        draw.text((table_x0 + (LEFT_COL_W - (bbox[2]-bbox[0]))/2, y0 + (CELL_H - (bbox[3]-bbox[1]))/2),
-                  label, fill=TEXT_COLOR, font=font_group)
 
         gp_hours = day_map.get(group, {}) if isinstance(day_map.get(group, {}), dict) else {}
         prev_gp_hours = prev_day_map.get(group, {}) if isinstance(prev_day_map.get(group, {}), dict) else {}
@@ -468,29 +454,90 @@ def render_single_date(data: dict, day_ts: int, day_key: str, output_filename: s
                     change_type = "better"
                     changes_better += 1
             
-            x0h = table_x0 + LEFT_COL_W + h*CELL_W
-            x1h = x0h + CELL_W
-            
-            draw_split_cell(draw, x0h, y0, x1h, y1, state, prev_state, next_state, change_type)
+            colors = _SPLIT_LUT.get((state, prev_state, next_state))
+            if colors is None:
+                # Невідомий стан у JSON — рахуємо напряму
+                colors = split_cell_colors(state, prev_state, next_state)
+            halves[r, 2*h:2*h + 2] = colors
+
+            if change_type:
+                x0h = table_x0 + LEFT_COL_W + h*CELL_W
+                changed_cells.append((x0h, y0, x0h + CELL_W, y1, change_type))
+
+    # --- Полотно таблиці: фони, клітинки й сітка одним масивом і однією вставкою ---
+    # Координати відносно (table_x0, hour_y0); внутрішні лінії товщиною LINE_W центровані, як у draw.line,
+    # зовнішні ліва й верхня межі — всередину таблиці; товщина ліній однакова по всій таблиці
+    col_x = LEFT_COL_W
+    body_y0 = HOUR_ROW_H
+    body_y1 = body_y0 + n_rows*CELL_H
+    grid_x1 = col_x + n_hours*CELL_W
+    lo = LINE_W // 2
+    canvas = np.empty((body_y1 + LINE_W - lo, grid_x1 + LINE_W - lo, 3), dtype=np.uint8)
+    canvas[:] = BG
+    canvas[:body_y0 + 1, :grid_x1 + 1] = HEADER_BG
+    canvas[body_y0:body_y1 + 1, :col_x + 1] = TABLE_BG
+    half_w = CELL_W // 2
+    canvas[body_y0:body_y1, col_x:grid_x1] = np.repeat(
+        np.repeat(halves, CELL_H, axis=0), [half_w, CELL_W - half_w] * n_hours, axis=1)
+
+    # Ліва межа таблиці та верхня межа рядка годин
+    canvas[:body_y1 + 1, :LINE_W] = GRID_COLOR
+    canvas[:LINE_W, :grid_x1 + 1] = GRID_COLOR
+    for k in range(LINE_W):
+        # Вертикалі годин і горизонталі рядків (разом з лівою колонкою) — кроковими зрізами,
+        # по одному на піксель товщини
+        canvas[:body_y1 + 1, col_x - lo + k::CELL_W] = GRID_COLOR
+        canvas[body_y0 - lo + k::CELL_H, :grid_x1 + 1] = GRID_COLOR
+    img.paste(Image.fromarray(canvas), (table_x0, hour_y0))
+
+    # --- Рядок годин ---
+    # Розміри підписів годин: лише 24 різні рядки + "-", рахуємо кожен один раз
+    hour_strs = [f"{i:02d}" for i in range(24)] + ["-"]
+    bbox_cache = {hs: draw.textbbox((0,0), hs, font=font_hour) for hs in hour_strs}
+    for h in range(24):
+        x0 = table_x0 + LEFT_COL_W + h*CELL_W
+        start = f"{h:02d}"
+        middle = "-"
+        end = f"{(h+1)%24:02d}"
+        bbox1 = bbox_cache[start]
+        bbox2 = bbox_cache[middle]
+        bbox3 = bbox_cache[end]
+        h1 = bbox1[3]-bbox1[1]
+        h2 = bbox2[3]-bbox2[1]
+        h3 = bbox3[3]-bbox3[1]
+        total_h = h1 + HOUR_LINE_GAP + h2 + HOUR_LINE_GAP + h3
+        y_cursor = hour_y0 + (HOUR_ROW_H - total_h)/2
+        draw.text((x0 + (CELL_W - (bbox1[2]-bbox1[0]))/2, y_cursor), start, fill=TEXT_COLOR, font=font_hour)
+        y_cursor += h1 + HOUR_LINE_GAP
+        draw.text((x0 + (CELL_W - (bbox2[2]-bbox2[0]))/2, y_cursor), middle, fill=TEXT_COLOR, font=font_hour)
+        y_cursor += h2 + HOUR_LINE_GAP
+        draw.text((x0 + (CELL_W - (bbox3[2]-bbox3[0]))/2, y_cursor), end, fill=TEXT_COLOR, font=font_hour)
+
+    # --- Ліва колонка ---
+    left_label = "Черга"
+    bbox = draw.textbbox((0,0), left_label, font=font_hour)
+    draw.text((table_x0 + (LEFT_COL_W - (bbox[2]-bbox[0]))/2, hour_y0 + (HOUR_ROW_H - (bbox[3]-bbox[1]))/2),
+              left_label, fill=TEXT_COLOR, font=font_hour)
+    for r, group in enumerate(rows):
+        y0 = table_y0 + r*CELL_H
+        label = group.replace("GPV", "").strip()
+        bbox = draw.textbbox((0,0), label, font=font_group)
+        draw.text((table_x0 + (LEFT_COL_W - (bbox[2]-bbox[0]))/2, y0 + (CELL_H - (bbox[3]-bbox[1]))/2),
+                  label, fill=TEXT_COLOR, font=font_group)
+
+    for cell in changed_cells:
+        draw_change_outline(draw, *cell)
 
     # Виводимо статистику змін
     if changes_worse > 0 or changes_better > 0:
         log(f"📈 Зміни в графіку: погіршень={changes_worse}, покращень={changes_better}")
         has_changes = True
 
-    # --- Лінії сітки ---
-    for i in range(0, 25):
-        x = table_x0 + LEFT_COL_W + i*CELL_W
-        draw.line([(x, table_y0 - HOUR_ROW_H), (x, table_y1)], fill=GRID_COLOR)
-    for r in range(n_rows+1):
-        y = table_y0 + r*CELL_H
-        draw.line([(table_x0, y), (table_x1, y)], fill=GRID_COLOR)
-
     # --- Легенда ---
     legend_states = ["yes", "no", "maybe"]
-    legend_y_start = table_y1 + 15
-    box_size = 18
-    gap = 15
+    legend_y_start = table_y1 + 15*SCALE
+    box_size = 18*SCALE
+    gap = 15*SCALE
     
     x_cursor = SPACING
     for state in legend_states:
@@ -500,10 +547,10 @@ def render_single_date(data: dict, day_ts: int, day_key: str, output_filename: s
         w_text = text_bbox[2] - text_bbox[0]
         
         draw.rectangle([x_cursor, legend_y_start, x_cursor + box_size, legend_y_start + box_size], 
-                      fill=color, outline=GRID_COLOR)
-        draw.text((x_cursor + box_size + 4, legend_y_start + (box_size - (text_bbox[3]-text_bbox[1]))/2), 
+                      fill=color, outline=GRID_COLOR, width=LINE_W)
+        draw.text((x_cursor + box_size + 4*SCALE, legend_y_start + (box_size - (text_bbox[3]-text_bbox[1]))/2), 
                  description, fill=TEXT_COLOR, font=font_legend)
-        x_cursor += box_size + 4 + w_text + gap
+        x_cursor += box_size + 4*SCALE + w_text + gap
     
     # Додаємо легенду для змін якщо є зміни
     if has_changes:
@@ -514,31 +561,31 @@ def render_single_date(data: dict, day_ts: int, day_key: str, output_filename: s
                       fill=TABLE_BG, outline=WORSE_OUTLINE, width=HIGHLIGHT_WIDTH)
         worse_text = "Більше відключень"
         text_bbox = draw.textbbox((0,0), worse_text, font=font_legend)
-        draw.text((x_cursor + box_size + 4, legend_y_start + (box_size - (text_bbox[3]-text_bbox[1]))/2), 
+        draw.text((x_cursor + box_size + 4*SCALE, legend_y_start + (box_size - (text_bbox[3]-text_bbox[1]))/2), 
                  worse_text, fill=TEXT_COLOR, font=font_legend)
-        x_cursor += box_size + 4 + (text_bbox[2] - text_bbox[0]) + gap
+        x_cursor += box_size + 4*SCALE + (text_bbox[2] - text_bbox[0]) + gap
         
         # Зелена рамка - покращення
         draw.rectangle([x_cursor, legend_y_start, x_cursor + box_size, legend_y_start + box_size], 
                       fill=TABLE_BG, outline=BETTER_OUTLINE, width=HIGHLIGHT_WIDTH)
         better_text = "Менше відключень"
         text_bbox = draw.textbbox((0,0), better_text, font=font_legend)
-        draw.text((x_cursor + box_size + 4, legend_y_start + (box_size - (text_bbox[3]-text_bbox[1]))/2), 
+        draw.text((x_cursor + box_size + 4*SCALE, legend_y_start + (box_size - (text_bbox[3]-text_bbox[1]))/2), 
                  better_text, fill=TEXT_COLOR, font=font_legend)
 
     # --- Інформація про публікацію ---
-    pub_text = fact.get("update") or data.get("lastUpdated") or datetime.now(ZoneInfo('Europe/Kyiv')).strftime("%d.%m.%Y")
+    pub_text = fact.get("update") or data.get("lastUpdated") or datetime.now(_KYIV).strftime("%d.%m.%Y")
     pub_label = f"Опубліковано {pub_text}"
     bbox_pub = draw.textbbox((0,0), pub_label, font=font_small)
     w_pub = bbox_pub[2] - bbox_pub[0]
     pub_x = width - w_pub - SPACING
-    pub_y = legend_y_start + box_size + 20
+    pub_y = legend_y_start + box_size + 20*SCALE
     draw.text((pub_x, pub_y), pub_label, fill=FOOTER_COLOR, font=font_small)
 
     # --- Інформація про проєкт ---   
-    info_y_start = legend_y_start + box_size + 20
+    info_y_start = legend_y_start + box_size + 20*SCALE
     x_text = SPACING
-    line_gap = 6
+    line_gap = 6*SCALE
 
     
     info_lines = [
@@ -558,9 +605,7 @@ def render_single_date(data: dict, day_ts: int, day_key: str, output_filename: s
         )
 
     out_path = OUT_DIR / output_filename
-    scale = 3
-    img_resized = img.resize((img.width*scale, img.height*scale), resample=Image.LANCZOS)
-    img_resized.save(out_path, optimize=True)
+    img.save(out_path, optimize=False, compress_level=1)
     log(f"✅ Збережено {out_path}")
 
 # --- Головна функція рендерингу ---
@@ -599,8 +644,8 @@ def generate_from_json(json_path):
         log(f"❌ JSON файл не знайдено: {json_path}")
         send_error(f"❌ JSON файл не знайдено: {json_path}")
         raise FileNotFoundError(f"JSON файл не знайдено: {json_path}")
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    with open(path, "rb") as f:
+        data = json_loads(f.read())
     log(f"▶️ Запускаю генерацію зображень з {json_path}")
     render(data, path)
 
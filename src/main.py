@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 import os, json, asyncio
+import PIL
 from zoneinfo import ZoneInfo
 from datetime import datetime
 from telegram_notify import send_error, send_message, send_photo
@@ -9,7 +10,7 @@ import gener_im_1_G
 import gener_im_full
 import upload_to_github
 import zoe_parser
-from utils import clean_log, clean_old_files, delete_json
+from utils import clean_log, clean_old_files, delete_json, get_log_handle
 
 LOG_DIR = "logs"
 FULL_LOG_FILE = os.path.join(LOG_DIR, "full_log.log")
@@ -20,8 +21,7 @@ def log(message):
     timestamp = datetime.now(ZoneInfo("Europe/Kyiv")).strftime("%Y-%m-%d %H:%M:%S")
     line = f"{timestamp} [main] {message}"
     print(line)
-    with open(FULL_LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(line + "\n")
+    get_log_handle(FULL_LOG_FILE).write(line + "\n")
 
 
 def send_schedule_photo(json_path: str, base_image_path: str = "out/images") -> None:
@@ -90,6 +90,12 @@ def main():
     else:
         log("⚠️ Файла логів ще не існує — очищення пропущено")
 
+    # Pillow-SIMD має суфікс .postN у версії — звичайний Pillow рендерить помітно повільніше
+    if ".post" in PIL.__version__:
+        log(f"🖼 Pillow-SIMD {PIL.__version__}")
+    else:
+        log(f"⚠️ Використовується звичайний Pillow {PIL.__version__} (не Pillow-SIMD)")
+
     json_path = "out/Zaporizhzhiaoblenergo.json"
 
     log("⚡ Запуск парсера…") 
@@ -4,6 +4,7 @@ from datetime import datetime
 from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
 from config import  BASE_DIR, BOT_PREFIX
+from utils import get_log_handle
 
 # --- Завантажуємо .env ---
 #BASE_DIR = os.path.dirname(os.path.dirname(__file__))  # вихід із /src
@@ -25,8 +26,7 @@ def log(message):
     print(line)
     #with open(LOG_FILE, "a", encoding="utf-8") as f:
     #    f.write(line + "\n")
-    with open(FULL_LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(line + "\n")
+    get_log_handle(FULL_LOG_FILE).write(line + "\n")
 
 
 # --- Відправка фото з підписом ---
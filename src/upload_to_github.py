@@ -3,14 +3,14 @@ import os
 import shutil
 from datetime import datetime
 from config import REGION, SOURCE_JSON, SOURCE_IMAGES, REPO_DIR, DATA_DIR, IMAGES_DIR, LOG_FILE, TIMEZONE
+from utils import get_log_handle
 
 def log(message):
     timestamp = datetime.now(TIMEZONE).strftime("%Y-%m-%d %H:%M:%S")
     text = f"{timestamp} [upload_to_github] {message}"
     print(text)
     try:
-        with open(LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(text + "\n")
+        get_log_handle(LOG_FILE).write(text + "\n")
     except:
         pass
 
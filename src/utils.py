@@ -1,10 +1,57 @@
 from datetime import datetime, timedelta
+import atexit
+import json
 import os
-from typing import List
+from typing import List, TextIO
+
+try:
+    import orjson
+except ImportError:  # без колеса orjson працюємо на стандартному json
+    orjson = None
 
 from datetime import datetime, timedelta
 
+# Відкриті файли логів: один дескриптор на файл за весь процес
+_log_handles = {}
+# Розмір буфера логу: рядки накопичуються і пишуться на диск блоками
+LOG_BUFFER_SIZE = 1 << 15
+
+
+def get_log_handle(log_file_path) -> TextIO:
+    """
+    Повертає відкритий на дозапис файл логу (відкривається при першому виклику,
+    закривається при завершенні процесу). Буфер дописується на диск при заповненні,
+    у clean_log і при виході — процес короткоживучий, тож tail -f побачить рядки наприкінці запуску.
+    """
+    key = os.path.abspath(log_file_path)
+    fh = _log_handles.get(key)
+    if fh is None:
+        fh = open(key, "a", encoding="utf-8", buffering=LOG_BUFFER_SIZE)
+        atexit.register(fh.close)
+        _log_handles[key] = fh
+    return fh
+
+
+def json_loads(data: bytes):
+    """Розбирає JSON з байтів (orjson, якщо встановлено)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj) -> bytes:
+    """JSON у UTF-8 з відступом 2 — як json.dump(..., ensure_ascii=False, indent=2)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
 def clean_log(log_file_path: str, days: int = 7):
+    # Дописуємо буфер відкритого дескриптора, щоб очищення бачило всі рядки
+    fh = _log_handles.get(os.path.abspath(log_file_path))
+    if fh is not None:
+        fh.flush()
+
     cutoff_time = datetime.now() - timedelta(days=days)
     kept_lines = []
     removed_count = 0
@@ -4,11 +4,13 @@
 
 import asyncio
 import re
-import json
 from datetime import datetime, date, timedelta
 from zoneinfo import ZoneInfo
 from playwright.async_api import async_playwright
+from bs4 import BeautifulSoup
+import requests
 import os
+from utils import get_log_handle, json_dumps, json_loads
 
 TZ = ZoneInfo("Europe/Kyiv")
 URL = "https://www.zoe.com.ua/%D0%B3%D1%80%D0%B0%D1%84%D1%96%D0%BA%D0%B8-%D0%BF%D0%BE%D0%B3%D0%BE%D0%B4%D0%B8%D0%BD%D0%BD%D0%B8%D1%85-%D1%81%D1%82%D0%B0%D0%B1%D1%96%D0%BB%D1%96%D0%B7%D0%B0%D1%86%D1%96%D0%B9%D0%BD%D0%B8%D1%85/"
@@ -20,125 +22,255 @@ FULL_LOG_FILE = os.path.join(LOG_DIR, "full_log.log")
 os.makedirs(LOG_DIR, exist_ok=True)
 os.makedirs("out", exist_ok=True)
 
+_MONTHS = {
+    'СІЧНЯ': '01', 'ЛЮТОГО': '02', 'БЕРЕЗНЯ': '03', 'КВІТНЯ': '04',
+    'ТРАВНЯ': '05', 'ЧЕРВНЯ': '06', 'ЛИПНЯ': '07', 'СЕРПНЯ': '08',
+    'ВЕРЕСНЯ': '09', 'ЖОВТНЯ': '10', 'ЛИСТОПАДА': '11', 'ГРУДНЯ': '12'
+}
+# Альтернація місяців для регулярних виразів; пошук за casefold-ключем — одна нормалізація на збіг
+_MONTHS_ALT = '|'.join(_MONTHS)
+_MONTHS_CF = {k.casefold(): v for k, v in _MONTHS.items()}
+
+# Статичний опис годинних проміжків для preset.time_zone (кортежі серіалізуються як масиви)
+_TIME_ZONE = {
+    str(i): (f"{i - 1:02d}-{i:02d}", f"{i - 1:02d}:00", f"{i:02d}:00")
+    for i in range(1, 25)
+}
+# Блок preset у вихідному JSON не залежить від даних — лише читається при серіалізації
+_PRESET = {
+    "time_zone": _TIME_ZONE,
+    "time_type": {
+        "yes": "Світло є",
+        "maybe": "Можливе відключення",
+        "no": "Світла немає",
+        "first": "Світла не буде перші 30 хв.",
+        "second": "Світла не буде другі 30 хв"
+    }
+}
+
+# ----------------- РЕГУЛЯРНІ ВИРАЗИ (компілюються один раз) -----------------
+_RE_HEADER_SCHED = re.compile(r'Години\s+відсутності\s+електропостачання', re.IGNORECASE)
+# Рядок групи "1.1: 05:30 – 10:30"; [^\S\n] — пробільні символи без переходу на новий рядок
+_RE_GROUP_LINE = re.compile(r'^[^\S\n]*(\d)\.(\d)[^\S\n]*:[^\S\n]*([^\n]+)', re.MULTILINE)
+_RE_INTERVAL = re.compile(r'(\d{1,2}:\d{2})\s*[–\-—]\s*(\d{1,2}:\d{2})')
+
+# Фрагменти заголовків дат — одне джерело для обох патернів нижче
+# Тип 1: ОНОВЛЕНО ГПВ НА 06 ГРУДНЯ (оновлено о 14:03)
+_HDR_UPDATED = r'ОНОВЛЕНО\s+ГПВ\s+НА\s+(\d{1,2})\s+(' + _MONTHS_ALT + r')'
+# Тип 2: 06 ГРУДНЯ ПО ЗАПОРІЗЬКІЙ ОБЛАСТІ ДІЯТИМУТЬ ГПВ
+_HDR_SCHEDULED = r'(\d{1,2})\s+(' + _MONTHS_ALT + r')\s+ПО\s+ЗАПОРІЗЬКІЙ\s+ОБЛАСТІ\s+ДІЯТИМУТЬ\s+ГПВ'
+# Тип 3: СКОРЕГОВАНИЙ ГПВ НА 17 ГРУДНЯ
+_HDR_CORRECTED = r'СКОРЕГОВАНИЙ\s+ГПВ\s+НА\s+(\d{1,2})\s+(' + _MONTHS_ALT + r')'
+
+# Комбінований патерн для ВСІХ типів заголовків (групи: 1-4 — тип 1, 5-6 — тип 2, 7-8 — тип 3)
+_RE_COMBINED = re.compile(
+    r'(?:'
+    + _HDR_UPDATED + r'[^\n]*?оновлено\s+о?\s*(\d{1,2})[:\-](\d{2})'
+    + r'|' + _HDR_SCHEDULED
+    + r'|' + _HDR_CORRECTED
+    + r')',
+    re.IGNORECASE
+)
+
+# Вкладені заголовки всередині блоку — одна альтернація, один прохід по тексту
+_RE_DATE_HEADERS = re.compile(
+    '|'.join((_HDR_UPDATED, _HDR_SCHEDULED, _HDR_CORRECTED)),
+    re.IGNORECASE
+)
+
+
+def month_number(name: str):
+    """Номер місяця ('01'..'12') за назвою в родовому відмінку, без урахування регістру"""
+    return _MONTHS_CF.get(name.casefold())
+
 
 def log(message: str):
     timestamp = datetime.now(TZ).strftime("%Y-%m-%d %H:%M:%S")
     line = f"{timestamp} [zaporizhzhia_parser] {message}"
     print(line)
-    with open(FULL_LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(line + "\n")
+    get_log_handle(FULL_LOG_FILE).write(line + "\n")
+
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+BROWSER_ARGS = [
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-blink-features=AutomationControlled"
+]
+VIEWPORT = {"width": 800, "height": 600}
+# Профіль Chromium між запусками: кеш і cookies лишаються теплими
+PW_PROFILE_DIR = ".pw-profile"
+# Потрібен лише текст — картинки, шрифти, стилі й медіа не завантажуємо
+BLOCKED_RESOURCE_TYPES = frozenset(("image", "font", "media", "stylesheet"))
+
+
+async def _block_resources(route, request):
+    if request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
 
 
-def time_to_hour(hhmm: str) -> float:
-    hh, mm = map(int, hhmm.split(":"))
-    return hh + (mm / 60.0)
+async def _fetch_page_text(context) -> str:
+    page = await context.new_page()
+    try:
+        await page.route("**/*", _block_resources)
+        await page.goto(URL, wait_until="domcontentloaded", timeout=20000)
+        await page.wait_for_selector("article", timeout=30000)
+        return await page.inner_text("body")
+    finally:
+        await page.close()
 
 
-async def fetch_text() -> str:
+async def fetch_text_browser() -> str:
+    """
+    Отримує текст сторінки графіків через Chromium (для сторінок, що рендеряться JS).
+    Браузер запускається з постійним профілем PW_PROFILE_DIR — дисковий кеш переживає запуск.
+    """
     async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=True, 
-            args=[
-                "--no-sandbox",
-                "--disable-setuid-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-blink-features=AutomationControlled"
-            ]
+        context = await p.chromium.launch_persistent_context(
+            PW_PROFILE_DIR,
+            headless=True,
+            user_agent=USER_AGENT,
+            viewport=VIEWPORT,
+            args=BROWSER_ARGS,
         )
-        context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
-        page = await context.new_page()
-        
         try:
-            await page.goto(URL, wait_until="domcontentloaded", timeout=60000)
-            await page.wait_for_selector("article", timeout=30000)
-            text = await page.inner_text("body")
+            return await _fetch_page_text(context)
         finally:
-            await browser.close()
-            
-        return text
+            await context.close()
+
+
+# Блокові теги, після яких inner_text браузера ставить перенос рядка
+_BLOCK_TAGS = ["p", "div", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6",
+               "article", "section", "header", "table", "ul", "ol"]
+# Мінімальна довжина тексту статей, за якої вважаємо, що графіки віддано без JS
+MIN_ARTICLE_CHARS = 200
+
+
+def _html_to_text(html, encoding: str = None) -> str:
+    """
+    Текст вузлів <article> (графіки публікуються як статті) з переносами рядків
+    приблизно як у page.inner_text(). Порожній рядок, якщо статей на сторінці немає.
+    Для байтів без encoding кодування визначає BeautifulSoup (<meta charset>, BOM, UTF-8).
+    """
+    soup = BeautifulSoup(html, "html.parser", from_encoding=encoding)
+    for tag in soup(["script", "style", "noscript"]):
+        tag.decompose()
+    for br in soup.find_all("br"):
+        br.replace_with("\n")
+    for tag in soup.find_all(_BLOCK_TAGS):
+        tag.append("\n")
+    return "\n".join(article.get_text() for article in soup.find_all("article"))
+
+
+def fetch_text_http() -> str:
+    """Отримує текст статей сторінки звичайним HTTP-запитом, без браузера"""
+    response = requests.get(URL, headers={"User-Agent": USER_AGENT}, timeout=30)
+    response.raise_for_status()
+    # Без charset у Content-Type requests підставляє ISO-8859-1 і псує кирилицю —
+    # тоді віддаємо сирі байти, і кодування береться з <meta charset> сторінки
+    content_type = response.headers.get("Content-Type", "")
+    charset = response.encoding if "charset" in content_type.lower() else None
+    return _html_to_text(response.content, charset)
 
 
-def put_interval(result: dict, group_id: str, t1: float, t2: float) -> None:
-    # Зсув на +1 годину
-    t1 += 1.0
-    t2 += 1.0
-    
-    for hour in range(1, 25):
-        h_start = float(hour)
-        h_mid = h_start + 0.5
-        h_end = h_start + 1.0
+async def fetch_text() -> str:
+    """
+    Сторінка ZOE рендериться на сервері, тому спершу пробуємо HTTP-запит —
+    він на порядки легший за Chromium. Playwright лишається запасним варіантом,
+    якщо статей немає, вони підозріло короткі або в них немає жодного заголовка графіка.
+    """
+    try:
+        text = await asyncio.to_thread(fetch_text_http)
+        if len(text) < MIN_ARTICLE_CHARS:
+            log(f"⚠️ У HTML немає статей або текст закороткий ({len(text)} симв.) — використовую Playwright")
+        elif _RE_COMBINED.search(text):
+            return text
+        else:
+            log("⚠️ У HTML не знайдено заголовків графіків — використовую Playwright")
+    except requests.RequestException as e:
+        log(f"⚠️ HTTP-запит не вдався ({e}) — використовую Playwright")
+    return await fetch_text_browser()
 
-        first_off = (t1 < h_mid and t2 > h_start)
-        second_off = (t1 < h_end and t2 > h_mid)
 
-        if not first_off and not second_off:
-            continue
+# Стан години за бітовою маскою: біт 1 — немає світла перші 30 хв, біт 2 — другі 30 хв
+_STATE_BY_MASK = ("yes", "first", "second", "no")
+# Ключі годин "1".."24" у JSON — рядки створюються один раз
+_HOUR_KEYS = tuple(str(h) for h in range(1, 25))
 
-        key = str(hour)
 
-        if first_off and second_off:
-            result[group_id][key] = "no"
-        elif first_off:
-            result[group_id][key] = "first"
-        elif second_off:
-            result[group_id][key] = "second"
+def put_interval(mask: list, m1: int, m2: int) -> None:
+    """Позначає в масці (індекс = година 1..24) половини годин, які перекриває інтервал (у хвилинах)"""
+    # Півгодина k = 2*година + (0 — перша, 1 — друга); зсув на +1 годину = +2 півгодини.
+    # Інтервал перекриває півгодину k, якщо m1 // 30 <= k < ceil(m2 / 30) — перебираємо лише їх
+    first = max(2, m1 // 30 + 2)
+    last = min(50, -(-m2 // 30) + 2)
+    for k in range(first, last):
+        mask[k >> 1] |= 1 << (k & 1)
 
 
-def parse_schedule_block(text: str, date_str: str, date_header_patterns: list) -> dict:
+def parse_schedule_block(text: str, date_str: str, date_header_pattern: re.Pattern) -> dict:
     """Парсить блок з графіком відключень"""
-    result = {}
+    masks = {}
     
     # Шукаємо текст між заголовком і списком графіків
-    schedule_start = re.search(r'Години\s+відсутності\s+електропостачання', text, re.IGNORECASE)
+    schedule_start = _RE_HEADER_SCHED.search(text)
     if schedule_start:
         text = text[schedule_start.end():]
         log(f"📍 Знайдено початок графіків для {date_str}")
     
     # КРИТИЧНО: Обрізаємо текст до наступного заголовка дати всередині блоку
-    for pattern in date_header_patterns:
-        next_date_match = re.search(pattern, text, re.IGNORECASE)
-        if next_date_match:
-            text = text[:next_date_match.start()]
-            log(f"✂️ Обрізано текст до наступного заголовка на позиції {next_date_match.start()}")
-            break
+    next_date_match = date_header_pattern.search(text)
+    if next_date_match:
+        text = text[:next_date_match.start()]
+        log(f"✂️ Обрізано текст до наступного заголовка на позиції {next_date_match.start()}")
     
-    lines = text.split('\n')
-    for line in lines:
-        line = line.strip()
-        
-        # Шукаємо формат "1.1: 05:30 – 10:30"
-        match = re.match(r'(\d)\.(\d)\s*:\s*(.+)', line)
-        if not match:
+    # Локальні посилання на функції гарячого циклу (LOAD_FAST замість пошуку в модулі)
+    _finditer = _RE_GROUP_LINE.finditer
+    _findall = _RE_INTERVAL.findall
+    _put = put_interval
+    _log = log
+
+    # Шукаємо формат "1.1: 05:30 – 10:30" одним проходом по всьому блоку
+    for match in _finditer(text):
+        text_content = match.group(3).strip()
+        if not text_content:
             continue
             
         group_num = f"{match.group(1)}.{match.group(2)}"
         group_id = "GPV" + group_num
-        text_content = match.group(3)
         
         # Перевіряємо чи не вимикається
         if 'не вимикається' in text_content.lower() or 'не вимикаються' in text_content.lower():
-            log(f"⚪ {group_id} — не вимикається")
+            _log(f"⚪ {group_id} — не вимикається")
             continue
         
-        if group_id not in result:
-            result[group_id] = {str(h): "yes" for h in range(1, 25)}
+        if group_id not in masks:
+            masks[group_id] = [0] * 25
+        mask = masks[group_id]
 
         # Шукаємо інтервали відключень
-        intervals = re.findall(r'(\d{1,2}:\d{2})\s*[–\-—]\s*(\d{1,2}:\d{2})', text_content)
+        intervals = _findall(text_content)
         
         for t1_str, t2_str in intervals:
-            try:
-                t1 = time_to_hour(t1_str)
-                t2 = time_to_hour(t2_str)
-                put_interval(result, group_id, t1, t2)
-            except:
+            # Формат "Г:ХХ"/"ГГ:ХХ" уже гарантує регулярний вираз — відкидаємо лише неможливий час
+            hh1, mm1 = int(t1_str[:-3]), int(t1_str[-2:])
+            hh2, mm2 = int(t2_str[:-3]), int(t2_str[-2:])
+            if hh1 > 24 or hh2 > 24 or mm1 > 59 or mm2 > 59:
+                _log(f"⚠️ {group_id} — некоректний час {t1_str}–{t2_str}, пропускаю")
                 continue
+            _put(mask, hh1 * 60 + mm1, hh2 * 60 + mm2)
         
         if intervals:
-            log(f"✔️ {group_id} — {intervals}")
+            _log(f"✔️ {group_id} — {intervals}")
     
+    # Маски → рядкові стани у форматі JSON
+    result = {}
+    for group_id, mask in masks.items():
+        result[group_id] = dict(zip(_HOUR_KEYS, map(_STATE_BY_MASK.__getitem__, mask[1:])))
     return result
 
 
@@ -147,59 +279,44 @@ async def main():
     html_text = await fetch_text()
     log("✔️ HTML отримано!")
 
-    today = datetime.now(TZ).date()
+    # Поточний час беремо один раз на весь запуск
+    now = datetime.now(TZ)
+    now_hm = now.strftime("%H:%M")
+    today = now.date()
     tomorrow = today + timedelta(days=1)
     today_str = today.strftime("%d.%m.%Y")
     tomorrow_str = tomorrow.strftime("%d.%m.%Y")
+    # Потрібні лише сьогодні й завтра: (день, місяць) -> ("ДД.ММ.РРРР", дата) з правильним роком (31.12 -> 01.01)
+    wanted_dates = {
+        (today.day, today.month): (today_str, today),
+        (tomorrow.day, tomorrow.month): (tomorrow_str, tomorrow),
+    }
 
     results_for_all_dates = {}
     updates_for_dates = {}
     processed_dates = set()
 
-    months = {
-        'СІЧНЯ': '01', 'ЛЮТОГО': '02', 'БЕРЕЗНЯ': '03', 'КВІТНЯ': '04',
-        'ТРАВНЯ': '05', 'ЧЕРВНЯ': '06', 'ЛИПНЯ': '07', 'СЕРПНЯ': '08',
-        'ВЕРЕСНЯ': '09', 'ЖОВТНЯ': '10', 'ЛИСТОПАДА': '11', 'ГРУДНЯ': '12'
-    }
-    
-    # Комбінований патерн для ВСІХ типів заголовків
-    combined_pattern = (
-        r'(?:'
-        # Тип 1: ОНОВЛЕНО ГПВ НА 06 ГРУДНЯ (оновлено о 14:03)
-        r'ОНОВЛЕНО\s+ГПВ\s+НА\s+(\d{1,2})\s+(' + '|'.join(months.keys()) + r')[^\n]*?оновлено\s+о?\s*(\d{1,2})[:\-](\d{2})'
-        r'|'
-        # Тип 2: 06 ГРУДНЯ ПО ЗАПОРІЗЬКІЙ ОБЛАСТІ ДІЯТИМУТЬ ГПВ
-        r'(\d{1,2})\s+(' + '|'.join(months.keys()) + r')\s+ПО\s+ЗАПОРІЗЬКІЙ\s+ОБЛАСТІ\s+ДІЯТИМУТЬ\s+ГПВ'
-        r'|'
-        # Тип 3: СКОРЕГОВАНИЙ ГПВ НА 17 ГРУДНЯ
-        r'СКОРЕГОВАНИЙ\s+ГПВ\s+НА\s+(\d{1,2})\s+(' + '|'.join(months.keys()) + r')'
-        r')'
-    )
-    
-    # Список патернів для виявлення вкладених заголовків всередині блоків
-    date_header_patterns = [
-        r'ОНОВЛЕНО\s+ГПВ\s+НА\s+\d{1,2}\s+(?:' + '|'.join(months.keys()) + r')',
-        r'\d{1,2}\s+(?:' + '|'.join(months.keys()) + r')\s+ПО\s+ЗАПОРІЗЬКІЙ\s+ОБЛАСТІ\s+ДІЯТИМУТЬ\s+ГПВ',
-        r'СКОРЕГОВАНИЙ\s+ГПВ\s+НА\s+\d{1,2}\s+(?:' + '|'.join(months.keys()) + r')'
-    ]
-    
-    for match in re.finditer(combined_pattern, html_text, re.IGNORECASE):
+    # Усі заголовки за один прохід; блок дати — до початку наступного заголовка
+    matches = list(_RE_COMBINED.finditer(html_text))
+
+    for i, match in enumerate(matches):
+        group = match.group
         # Визначаємо який тип заголовка знайдено
-        if match.group(1):  # Тип 1: ОНОВЛЕНО ГПВ
-            day = match.group(1).zfill(2)
-            month = months.get(match.group(2).upper())
-            update_hour = match.group(3).zfill(2) if match.group(3) else None
-            update_minute = match.group(4) if match.group(4) else None
+        if group(1):  # Тип 1: ОНОВЛЕНО ГПВ
+            day = group(1)
+            month = month_number(group(2))
+            update_hour = group(3)
+            update_minute = group(4)
             header_type = "ОНОВЛЕНО"
-        elif match.group(5):  # Тип 2: ПО ЗАПОРІЗЬКІЙ ОБЛАСТІ
-            day = match.group(5).zfill(2)
-            month = months.get(match.group(6).upper())
+        elif group(5):  # Тип 2: ПО ЗАПОРІЗЬКІЙ ОБЛАСТІ
+            day = group(5)
+            month = month_number(group(6))
             update_hour = None
             update_minute = None
             header_type = "ДІЯТИМУТЬ"
         else:  # Тип 3: СКОРЕГОВАНИЙ ГПВ
-            day = match.group(7).zfill(2)
-            month = months.get(match.group(8).upper())
+            day = group(7)
+            month = month_number(group(8))
             update_hour = None
             update_minute = None
             header_type = "СКОРЕГОВАНИЙ"
@@ -207,11 +324,11 @@ async def main():
         if not month:
             continue
         
-        date_str = f"{day}.{month}.{datetime.now(TZ).year}"
-        
-        # Пропускаємо якщо не today/tomorrow
-        if date_str not in (today_str, tomorrow_str):
+        # Пропускаємо якщо не today/tomorrow — дешева перевірка до будь-якої іншої роботи
+        wanted = wanted_dates.get((int(day), int(month)))
+        if wanted is None:
             continue
+        date_str, day_date = wanted
         
         # Пропускаємо якщо вже оброблено
         if date_str in processed_dates:
@@ -220,40 +337,41 @@ async def main():
         
         log(f"📅 {header_type}: Обробляю {date_str}")
         
-        # Зберігаємо час оновлення
+        # Час оновлення — одразу datetime із захоплених чисел (порівнюємо за датою й часом, а не як рядки).
+        # "оновлено о ГГ:ХХ" не має власної дати: це день публікації, тобто сьогодні,
+        # а якщо такий час ще не настав — учора. Дата графіка (day_date) тут ні до чого.
+        update_dt = None
         if update_hour and update_minute:
-            update_time = f"{update_hour}:{update_minute}"
-            updates_for_dates[date_str] = f"{update_time} {date_str}"
-            log(f"🕒 Update з тексту: {update_time}")
-        else:
-            current_time = datetime.now(TZ).strftime("%H:%M")
-            updates_for_dates[date_str] = f"{current_time} {today_str}"
-            log(f"⚠️ Не знайдено час оновлення для {date_str}, використано поточний: {current_time}")
-        
-        # Витягуємо блок до наступного заголовка
-        match_end = match.end()
-        
-        # Шукаємо наступний заголовок будь-якого типу
-        next_match = re.search(combined_pattern, html_text[match_end:], re.IGNORECASE)
+            try:
+                update_dt = now.replace(hour=int(update_hour), minute=int(update_minute), second=0, microsecond=0)
+                if update_dt > now:
+                    update_dt -= timedelta(days=1)
+                log(f"🕒 Update з тексту: {update_dt:%H:%M}")
+            except ValueError:
+                log(f"⚠️ Некоректний час оновлення {update_hour}:{update_minute} для {date_str}")
+        if update_dt is None:
+            update_dt = now.replace(second=0, microsecond=0)
+            log(f"⚠️ Не знайдено час оновлення для {date_str}, використано поточний: {now_hm}")
+        updates_for_dates[date_str] = update_dt
         
-        if next_match:
-            schedule_block = html_text[match.start():match_end + next_match.start()]
+        # Витягуємо блок до наступного заголовка будь-якого типу
+        if i + 1 < len(matches):
+            block_end = matches[i + 1].start()
         else:
-            schedule_block = html_text[match.start():match.start() + 5000]
+            block_end = min(match.start() + 5000, len(html_text))
+        schedule_block = html_text[match.start():block_end]
         
         log(f"📦 Розмір блоку: {len(schedule_block)} символів")
         
-        # Парсимо графік (передаємо список патернів для виявлення вкладених дат)
-        result = parse_schedule_block(schedule_block, date_str, date_header_patterns)
+        # Парсимо графік (передаємо патерн для виявлення вкладених дат)
+        result = parse_schedule_block(schedule_block, date_str, _RE_DATE_HEADERS)
         
         if not result:
             log(f"⚠️ Не знайдено графіків для {date_str}")
             continue
         
-        # Створюємо timestamp
-        day_int, month_int, year_int = map(int, date_str.split("."))
-        date_dt = datetime(year_int, month_int, day_int, tzinfo=TZ)
-        date_ts = int(date_dt.timestamp())
+        # Створюємо timestamp початку доби
+        date_ts = int(datetime(day_date.year, day_date.month, day_date.day, tzinfo=TZ).timestamp())
         
         results_for_all_dates[str(date_ts)] = result
         processed_dates.add(date_str)
@@ -265,22 +383,20 @@ async def main():
 
     # Перевіряємо DIFF
     if os.path.exists(OUTPUT_FILE):
-        with open(OUTPUT_FILE, "r", encoding="utf-8") as f:
-            old_json = json.load(f)
+        with open(OUTPUT_FILE, "rb") as f:
+            old_json = json_loads(f.read())
         old_data = old_json.get("fact", {}).get("data", {})
 
-        if json.dumps(old_data, sort_keys=True) == json.dumps(results_for_all_dates, sort_keys=True):
+        # dict/list/str порівнюються рекурсивно в C, порядок ключів не важливий
+        if old_data == results_for_all_dates:
             log("ℹ️ Дані не змінилися — JSON не оновлюємо")
             return False
 
     # Вибираємо найновіше оновлення
     if updates_for_dates:
-        latest_update_value = max(updates_for_dates.values())
-        latest_update_formatted = datetime.strptime(
-            latest_update_value, "%H:%M %d.%m.%Y"
-        ).strftime("%d.%m.%Y %H:%M")
+        latest_update_formatted = max(updates_for_dates.values()).strftime("%d.%m.%Y %H:%M")
     else:
-        latest_update_formatted = datetime.now(TZ).strftime("%d.%m.%Y %H:%M")
+        latest_update_formatted = now.strftime("%d.%m.%Y %H:%M")
     
     log(f"🕑 Обрано фінальне оновлення: {latest_update_formatted}")
 
@@ -291,31 +407,31 @@ async def main():
     # Формуємо JSON
     new_json = {
         "regionId": "Zaporizhzhia",
-        "lastUpdated": datetime.now(ZoneInfo("UTC")).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
+        "lastUpdated": now.astimezone(ZoneInfo("UTC")).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
         "fact": {
             "data": results_for_all_dates,
             "update": latest_update_formatted,
             "today": int(datetime(today.year, today.month, today.day, tzinfo=TZ).timestamp())
         },
-        "preset": {
-            "time_zone": {
-                str(i): [f"{i - 1:02d}-{i:02d}", f"{i - 1:02d}:00", f"{i:02d}:00"]
-                for i in range(1, 25)
-            },
-            "time_type": {
-                "yes": "Світло є",
-                "maybe": "Можливе відключення",
-                "no": "Світла немає",
-                "first": "Світла не буде перші 30 хв.",
-                "second": "Світла не буде другі 30 хв"
-            }
-        }
+        "preset": _PRESET
     }
 
     # Записуємо JSON
     log(f"💾 Записую JSON → {OUTPUT_FILE}")
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(new_json, f, ensure_ascii=False, indent=2)
+    # Пишемо у тимчасовий файл і атомарно підміняємо — генератори PNG не прочитають недописаний JSON
+    tmp_file = OUTPUT_FILE + ".tmp"
+    payload = json_dumps(new_json)
+    fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        # Для звичайного файлу це один write; цикл лише на випадок часткового запису
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+        # Дані на диску до rename — після збою живлення не лишиться порожній JSON
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_file, OUTPUT_FILE)
 
     log("✔️ JSON оновлено")
     return True